@@ -7,6 +7,23 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 import xopt
 from xopt.models import Module
 import math
+from functools import lru_cache
+from types import MappingProxyType
+
+
+# Safe namespace for eval, shared across calls (read-only so expressions can't rebind names)
+_SAFE_DICT = MappingProxyType({
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'exp': math.exp, 'log': math.log, 'sqrt': math.sqrt,
+    'pow': pow, 'abs': abs, 'floor': math.floor, 'ceil': math.ceil,
+    'pi': math.pi, 'e': math.e
+})
+
+
+@lru_cache(maxsize=512)
+def _compile_expr(expr: str):
+    """Compile an expression once; the LLM often repeats the same tool call"""
+    return compile(expr, "<calc>", "eval")
 
 
 @xopt.module
@@ -28,22 +45,9 @@ def calculator() -> Module:
         if 'import' in input_expr:
             raise ValueError("Import statements are not allowed")
         
-        allowed_chars = set('0123456789.+-*/() ')
-        allowed_funcs = {
-            'sin', 'cos', 'tan', 'exp', 'log', 'sqrt', 
-            'pow', 'abs', 'floor', 'ceil', 'pi', 'e'
-        }
-        
-        # Create safe namespace for eval
-        safe_dict = {
-            'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
-            'exp': math.exp, 'log': math.log, 'sqrt': math.sqrt,
-            'pow': pow, 'abs': abs, 'floor': math.floor, 'ceil': math.ceil,
-            'pi': math.pi, 'e': math.e
-        }
-        
         try:
-            result = eval(input_expr, {"__builtins__": {}}, safe_dict)
+            code = _compile_expr(input_expr)
+            result = eval(code, {"__builtins__": {}}, _SAFE_DICT)
             return float(result)
         except Exception as e:
             raise ValueError(f"Invalid calculation: {input_expr}") from e
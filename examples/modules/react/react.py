@@ -1,19 +1,63 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Tuple, Dict, Any
 import xopt
 from xopt.models import StepResult, Module, Context
+from collections import OrderedDict
+import functools
+import hashlib
 import json
+import logging
 import math
 import re
 
 
+# Line prefixes recognised by from_text and the field each one starts
+# ("Observation:" ends the active field without starting a new one)
+_FIELD_PREFIXES = (
+    ("Thought:", "thought"),
+    ("Action Input:", "action_input"),
+    ("Action:", "action"),
+    ("Final Answer:", "final_answer"),
+    ("Observation:", None),
+)
+
+# Action values that mean "no tool call"
+_EMPTY_ACTIONS = frozenset({'', 'none', 'null', 'n/a'})
+
+
+def _strip_quotes(text: str) -> str:
+    """Strip one pair of matching surrounding quotes"""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in ('"', "'"):
+        return text[1:-1]
+    return text
+
+
+def _finalize_fields(thought: Optional[str], action: Optional[str], action_input: Optional[str], final_answer: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """Normalize raw parsed fields: strip text, drop "no tool" actions and unquote the action input"""
+    thought = thought.strip() or None if thought else None
+    action = action.strip() if action else None
+    
+    # Only keep the action (and its input) if it names an actual tool
+    if not action or action.lower() in _EMPTY_ACTIONS:
+        action = action_input = None
+    elif action_input:
+        action_input = _strip_quotes(action_input.strip()) or None
+    
+    final_answer = final_answer.strip() or None if final_answer else None
+    return thought, action, action_input, final_answer
+
+
 class ReactInput(BaseModel):
     """Input for ReAct step"""
+    model_config = ConfigDict(frozen=True)
+    
     input: str
 
 
 class ReactOutput(BaseModel):
     """Output from ReAct step"""
+    model_config = ConfigDict(frozen=True)
+    
     thought: str
     action: Optional[str] = None
     action_input: Optional[Dict[str, Any]] = None
@@ -23,6 +67,8 @@ class ReactOutput(BaseModel):
 
 class ReactLLMResponse(BaseModel):
     """Structured parser for ReAct LLM responses"""
+    model_config = ConfigDict(frozen=True)
+    
     thought: Optional[str] = Field(None, description="The reasoning thought")
     action: Optional[str] = Field(None, description="The action to take")
     action_input: Optional[str] = Field(None, description="The input for the action")
@@ -31,38 +77,42 @@ class ReactLLMResponse(BaseModel):
     @classmethod
     def from_text(cls, text: str) -> "ReactLLMResponse":
         """Parse ReAct response from text using field extraction"""
-        # Extract thought
-        thought_match = re.search(r"Thought:\s*(.+?)(?=\n(?:Action|Final Answer)|\Z)", text, re.DOTALL)
-        thought = thought_match.group(1).strip() if thought_match else None
-        
-        # Extract action - only match content on the same line as Action:
-        action_match = re.search(r"Action:([^\n]*)", text)
-        action = None
-        action_input = None
-        
-        if action_match:
-            action_text = action_match.group(1).strip()
-            # Only set action if it's not empty, not just whitespace, and has actual content
-            if (action_text and 
-                action_text.lower() not in ['none', 'null', 'n/a', ''] and
-                len(action_text.strip()) > 0):
-                action = action_text
-                
-                # Extract action input
-                action_input_match = re.search(r"Action Input:\s*(.+?)(?=\n(?:Observation|Final Answer)|\Z)", text, re.DOTALL)
-                if action_input_match:
-                    action_input = action_input_match.group(1).strip()
-                    # Strip quotes if present
-                    if action_input.startswith('"') and action_input.endswith('"'):
-                        action_input = action_input[1:-1]
-                    elif action_input.startswith("'") and action_input.endswith("'"):
-                        action_input = action_input[1:-1]
+        # Single pass over the lines, collecting the first thought/action/action input
+        # and the last final answer
+        fields = {}
+        # Cheap substring checks skip the scan for unstructured text
+        if "Thought:" in text or "Action:" in text or "Final Answer:" in text:
+            current = None  # Lines of the field being collected
+            for line in text.splitlines():
+                stripped = line.lstrip()
+                for prefix, name in _FIELD_PREFIXES:
+                    if stripped.startswith(prefix):
+                        rest = stripped[len(prefix):]
+                        current = None
+                        if name == "action":
+                            # Action only counts content on the same line
+                            fields.setdefault(name, rest)
+                        elif name == "final_answer" or (name and name not in fields):
+                            current = fields[name] = [rest]
+                        break
+                else:
+                    if current is not None:
+                        if not stripped and current is fields.get("final_answer"):
+                            # A blank line ends the final answer
+                            current = None
+                        else:
+                            current.append(line)
+            
+            for name in ("thought", "action_input", "final_answer"):
+                if name in fields:
+                    fields[name] = "\n".join(fields[name])
         
-        # Extract final answer - get the last occurrence if multiple exist
-        final_answer_matches = re.findall(r"Final Answer:\s*(.+?)(?=\n\n|\n(?:Thought|Action)|$)", text, re.DOTALL)
-        final_answer = final_answer_matches[-1].strip() if final_answer_matches else None
+        thought, action, action_input, final_answer = _finalize_fields(
+            fields.get("thought"), fields.get("action"), fields.get("action_input"), fields.get("final_answer")
+        )
         
-        return cls(
+        # Fields are already str/None - skip validation
+        return cls.model_construct(
             thought=thought,
             action=action,
             action_input=action_input, 
@@ -70,6 +120,8 @@ class ReactLLMResponse(BaseModel):
         )
 
 
+logger = logging.getLogger("xopt.react")
+
 xopt_client = xopt.client()
 
 # Global variable to track current trace instance for LLM calls  
@@ -81,16 +133,36 @@ def set_current_trace_instance(instance):
     _current_trace_instance = instance
 
 
+# Static section headers for ReActContext.get_context
+_PREVIOUS_REASONING = "\n\nPrevious reasoning:\n"
+_OBSERVATION = "\n\nObservation: "
+_CONTINUE_REASONING = "\n\nContinue reasoning:"
+
+
 class ReActContext(Context):
     """ReAct context implementation that accumulates reasoning steps and observations"""
     
+    __slots__ = ("query", "reasoning_history", "current_observation", "prompt_prefix", "_reasoning_text")
+    
     def __init__(self, query: str):
+        self.reset(query)
+    
+    def reset(self, query: str):
+        """Clear all state so the context can be reused for a new query"""
         self.query = query
         self.reasoning_history = []
         self.current_observation = None
+        # Instructions + tool list, built on the first react_step for this query
+        self.prompt_prefix = None
+        # "Previous reasoning" section, extended on each add_reasoning instead of re-joined per step
+        self._reasoning_text = ""
     
     def add_reasoning(self, content: str):
         """Add reasoning content to history"""
+        if self.reasoning_history:
+            self._reasoning_text += "\n" + content
+        else:
+            self._reasoning_text = _PREVIOUS_REASONING + content
         self.reasoning_history.append(content)
     
     def set_observation(self, observation: str):
@@ -99,27 +171,44 @@ class ReActContext(Context):
     
     def get_context(self, text: Optional[str] = None) -> str:
         """Get the full context for ReAct reasoning"""
-        context_parts = []
-        
-        # Add query
-        context_parts.append(f"User question: {self.query}")
-        
-        # Add reasoning history
-        if self.reasoning_history:
-            context_parts.append("\nPrevious reasoning:")
-            for reasoning in self.reasoning_history:
-                context_parts.append(reasoning)
-        
-        # Add current observation if available
-        if self.current_observation:
-            context_parts.append(f"\nObservation: {self.current_observation}")
-            context_parts.append("\nContinue reasoning:")
+        # Sections are separated by a blank line; reasoning entries by a newline
+        observation = f"{_OBSERVATION}{self.current_observation}{_CONTINUE_REASONING}" if self.current_observation else ""
+        extra = f"\n\n{text}" if text else ""
         
-        # Add new text if provided
-        if text:
-            context_parts.append(f"\n{text}")
-            
-        return "\n".join(context_parts)
+        return f"User question: {self.query}{self._reasoning_text}{observation}{extra}"
+
+class _ContextPool:
+    """Free list of ReActContext objects, reused across calls instead of reallocated"""
+    
+    __slots__ = ("_free", "_max_size")
+    
+    def __init__(self, max_size: int = 64):
+        self._free = []
+        self._max_size = max_size
+    
+    def acquire(self, query: str) -> ReActContext:
+        """Get a fresh context for a query"""
+        # pop() is atomic, so concurrent callers can't both take the last context
+        try:
+            context = self._free.pop()
+        except IndexError:
+            return ReActContext(query)
+        context.reset(query)
+        return context
+    
+    def release(self, context: ReActContext):
+        """Return a finished context to the pool"""
+        if len(self._free) < self._max_size:
+            self._free.append(context)
+
+
+_CONTEXT_POOL = _ContextPool()
+
+
+def _respond(context: ReActContext, content: str) -> StepResult:
+    """Finish the reasoning chain with a response, recycling its context"""
+    _CONTEXT_POOL.release(context)
+    return StepResult(action="response", content=content)
 
 react_prompt = xopt_client.tunable(
     name="react_prompt",
@@ -136,64 +225,143 @@ tool_list = xopt_client.configurable(
     description="List of tools that the ReAct module can use",
 )
 
+cache_policy = xopt_client.tunable(
+    name="cache_policy",
+    description="LLM response caching: 'exact' reuses responses for identical prompts, anything else disables it",
+)
 
+canned_replies = xopt_client.tunable(
+    name="canned_replies",
+    description="'on' answers bare greetings and thanks without calling the LLM (bypassing react_prompt); anything else disables it",
+)
 
-def parse_react_response(llm_response: str) -> Dict[str, Any]:
-    """Parse LLM response using configurable regex parser"""
+# Queries that never need tools or reasoning - answered without an LLM call
+_GREETINGS = frozenset({"hey", "hi", "hello", "yo", "hey there", "hi there", "hello there", "thanks", "thank you", "thx"})
+_GREETING_REPLY = "Hi! How can I help?"
+_THANKS_REPLY = "You're welcome! Anything else I can help with?"
+
+
+def _trivial_reply(query: str) -> Optional[str]:
+    """Return a canned reply for a bare greeting or thanks, else None"""
+    normalized = query.strip().rstrip("!.?, ").lower()
+    if normalized not in _GREETINGS:
+        return None
+    return _THANKS_REPLY if normalized.startswith("th") else _GREETING_REPLY
+
+
+# The model's turn ends where a tool observation would be inserted
+_STOP_MARKER = "\nObservation:"
+
+
+# call_llm_stream ends a failed stream with a chunk like this
+_STREAM_ERROR = "Error: LLM call failed:"
+
+
+def _generate(prompt: str) -> Tuple[str, bool]:
+    """Stream an LLM response, stopping as soon as the model starts inventing an observation
+
+    Returns the response and whether it completed; a failed stream returns
+    the error text (as call_llm would) rather than the partial response.
+    """
+    text = ""
+    stream = xopt.call_llm_stream(prompt, model="ollama/llama3.2:3b", trace_instance=_current_trace_instance, stop=[_STOP_MARKER])
     try:
-        # Get the regex pattern from tunable
-        regex_pattern = output_parser()
+        for chunk in stream:
+            if chunk.startswith(_STREAM_ERROR):
+                return chunk, False
+            # Only the new tail (plus a marker's worth of overlap) can contain the marker
+            start = max(0, len(text) - len(_STOP_MARKER))
+            text += chunk
+            # Some providers ignore stop sequences - cut generation off ourselves
+            cut = text.find(_STOP_MARKER, start)
+            if cut >= 0:
+                text = text[:cut]
+                break
+    finally:
+        stream.close()
+    return text.strip(), True
+
+
+# Exact-match LLM response cache (LRU), keyed by a digest of the prompt
+_LLM_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_LLM_CACHE_SIZE = 512
+
+
+def _call_llm(prompt: str) -> str:
+    """Call the LLM, reusing the response for an identical prompt when caching is enabled"""
+    if cache_policy() != "exact":
+        return _generate(prompt)[0]
+    
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+    if key in _LLM_CACHE:
+        _LLM_CACHE.move_to_end(key)
+        return _LLM_CACHE[key]
+    
+    llm_response, complete = _generate(prompt)
+    # Failed or truncated responses must not be replayed for later identical prompts
+    if complete:
+        _LLM_CACHE[key] = llm_response
+        if len(_LLM_CACHE) > _LLM_CACHE_SIZE:
+            _LLM_CACHE.popitem(last=False)
+    return llm_response
 
-        print(f"Using regex pattern: {regex_pattern}")
-        
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_parser(regex_pattern: str) -> "re.Pattern":
+    """Compile the output_parser tunable once per distinct pattern"""
+    return re.compile(regex_pattern, re.DOTALL)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_cached(regex_pattern: str, llm_response: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """Parse an LLM response into an immutable (thought, action, action_input, final_answer) tuple"""
+    try:
         # Use the regex pattern to parse the response
-        match = re.search(regex_pattern, llm_response, re.DOTALL)
-        
-        if match:
-            result = {
-                "thought": match.group('thought').strip() if match.group('thought') else "",
-                "action": match.group('action').strip() if match.group('action') else None,
-                "action_input": match.group('action_input').strip() if match.group('action_input') else None,
-                "final_answer": match.group('final_answer').strip() if match.group('final_answer') else None
-            }
-            
-            # Clean up action - only set if it has actual content
-            if result["action"]:
-                action_text = result["action"]
-                if not action_text or action_text.lower() in ['none', 'null', 'n/a', '']:
-                    result["action"] = None
-                    result["action_input"] = None
-            
-            # Strip quotes from action_input if present
-            if result["action_input"]:
-                action_input = result["action_input"]
-                if action_input.startswith('"') and action_input.endswith('"'):
-                    result["action_input"] = action_input[1:-1]
-                elif action_input.startswith("'") and action_input.endswith("'"):
-                    result["action_input"] = action_input[1:-1]
-            
-            # If we have an action, prioritize it over any premature final answer
-            if result["action"] and result["action_input"] and result["final_answer"]:
-                result["final_answer"] = None
-            
-            return result
-        else:
+        match = _compile_parser(regex_pattern).search(llm_response)
+        if not match:
             # No match found, return empty result
-            return {
-                "thought": "",
-                "action": None,
-                "action_input": None,
-                "final_answer": None
-            }
+            return "", None, None, None
+        
+        thought, action, action_input, final_answer = _finalize_fields(
+            match.group('thought'), match.group('action'), match.group('action_input'), match.group('final_answer')
+        )
     except Exception:
         # Fallback to original parsing if regex parser fails
         parsed = ReactLLMResponse.from_text(llm_response)
-        return {
-            "thought": parsed.thought or "",
-            "action": parsed.action,
-            "action_input": parsed.action_input,
-            "final_answer": parsed.final_answer
-        }
+        thought, action, action_input, final_answer = parsed.thought, parsed.action, parsed.action_input, parsed.final_answer
+    
+    # If we have an action, prioritize it over any premature final answer
+    if action and action_input and final_answer:
+        final_answer = None
+    
+    return thought or "", action, action_input, final_answer
+
+
+def parse_react_response(llm_response: str) -> Dict[str, Any]:
+    """Parse LLM response using configurable regex parser"""
+    # Get the regex pattern from tunable
+    regex_pattern = output_parser()
+
+    logger.debug("Using regex pattern: %s", regex_pattern)
+    
+    # Parsing is memoized on (pattern, response); build a fresh dict for the caller
+    thought, action, action_input, final_answer = _parse_cached(regex_pattern, llm_response)
+    return {
+        "thought": thought,
+        "action": action,
+        "action_input": action_input,
+        "final_answer": final_answer
+    }
+
+
+@functools.lru_cache(maxsize=16)
+def _tools_text(tools_key: Tuple[str, ...]) -> str:
+    """Render the tool descriptions for a set of tools"""
+    return "\n\n".join(
+        f"Tool name: {tool['name']}\nDescription: {tool['long_description']}"
+        for tool in map(xopt.details, tools_key)
+    ) or "No tools available."
 
 
 @xopt.step
@@ -208,7 +376,7 @@ def react_starter(input_data: str) -> StepResult:
         StepResult: Points to react_step with context
     """
     # Create initial context
-    context = ReActContext(input_data)
+    context = _CONTEXT_POOL.acquire(input_data)
     
     # Return step result pointing to react_step
     return StepResult(
@@ -234,47 +402,35 @@ def react_step(step_input: Dict[str, Any]) -> StepResult:
     context = step_input.get("context")
     previous_action_result = step_input.get("previous_action_result")
     
+    # Greetings and thanks don't need a round-trip to the LLM, when enabled
+    if not context.reasoning_history and previous_action_result is None and canned_replies() == "on":
+        reply = _trivial_reply(context.query)
+        if reply:
+            return _respond(context, reply)
+    
     # Add previous action result as observation if available
     if previous_action_result:
         context.set_observation(previous_action_result)
-    # Get available tools from configurables
-    available_tools = tool_list
-    tool_details = []
-    for tool in available_tools:
-        details = xopt.details(tool)
-        tool_details.append(details)
-    
-    tool_descriptions = []
-    for tool in tool_details:
-        tool_descriptions.append(f"Tool name: {tool['name']}\nDescription: {tool['long_description']}")
-    
-    tools_text = "\n\n".join(tool_descriptions) if tool_descriptions else "No tools available."
+    # The instructions and tool list don't change within a query, so build them once
+    if context.prompt_prefix is None:
+        # Get available tools from configurables; their descriptions are static, so render once
+        tools_text = _tools_text(tuple(tool_list))
+        context.prompt_prefix = f"{react_prompt()}\n\nAvailable tools:\n{tools_text}\n\n"
     
     # Build prompt using context
-    base_prompt = react_prompt()
-    current_prompt = f"""{base_prompt}
-
-Available tools:
-{tools_text}
-
-{context.get_context()}
-
-Response:"""
+    current_prompt = context.prompt_prefix + context.get_context() + "\n\nResponse:"
         
-    llm_response = xopt.call_llm(current_prompt, model="ollama/llama3.2:3b", trace_instance=_current_trace_instance)
+    llm_response = _call_llm(current_prompt)
     
     # Add this reasoning to context
     context.add_reasoning(llm_response)
         
     parsed = parse_react_response(llm_response)
 
-    print(parsed)
+    logger.debug("Parsed response: %s", parsed)
         
     if parsed["final_answer"]:
-        return StepResult(
-            action="response",
-            content=parsed["final_answer"]
-        )
+        return _respond(context, parsed["final_answer"])
         
     if parsed["action"] and parsed["action_input"]:
         action = parsed["action"]
@@ -288,10 +444,7 @@ Response:"""
             module_input={"input": action_input, "context": context}
         )
     else:
-        return StepResult(
-            action="response",  
-            content=parsed["thought"] or "I'm not sure how to help with that."
-        ) 
+        return _respond(context, parsed["thought"] or "I'm not sure how to help with that.") 
 
 @xopt.module
 def react_module() -> Module:
@@ -307,7 +460,7 @@ def react_module() -> Module:
         version="0.1.0",
         description="ReAct framework",
         long_description="This module takes a user's input and generates a response using the ReAct framework. It can call other modules for specific actions. The input is a question or request, and the output is a response based on reasoning and available tools. The question or request can be arbitrary. The success of the response is based on the tools available.",
-        tunables=[react_prompt, output_parser],
+        tunables=[react_prompt, output_parser, cache_policy, canned_replies],
         configurables=[tool_list]
     )
 
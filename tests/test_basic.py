@@ -1,3 +1,13 @@
 def test_import():
     import xopt.cli
     assert True
+
+
+def test_import_is_lazy():
+    import subprocess
+    import sys
+
+    # Fresh interpreter - other tests may already have imported these
+    code = "import sys, xopt; print('xopt.llm' in sys.modules, 'xopt.models' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
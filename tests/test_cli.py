@@ -0,0 +1,44 @@
+import io
+import json
+import sys
+
+from xopt.cli import build_parser, dispatch
+
+
+def test_batch_runs_each_line(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"argv": ["list"]}\n{"argv": ["uninstall", "xopt/missing"]}\n'))
+
+    dispatch(build_parser().parse_args(["batch"]))
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["rc"] for r in results] == [0, 1]
+    assert results[0]["stdout"] == "No modules installed\n"
+
+
+def test_daemon_survives_bad_clients(tmp_path, monkeypatch):
+    import socket
+    import threading
+    import time
+    from xopt.runner import request_daemon, serve
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    sock_path = tmp_path / "daemon.sock"
+    worker = threading.Thread(target=serve, args=(str(sock_path),), daemon=True)
+    worker.start()
+    while not sock_path.exists():
+        time.sleep(0.01)
+
+    # Garbage, and a client that hangs up without sending anything
+    for payload in (b"not json\n", b"[1]\n", b""):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(sock_path))
+            conn.sendall(payload)
+
+    assert request_daemon(sock_path, {}) == {"ok": True}
+    reply = request_daemon(sock_path, {"module": "xopt/missing", "input": "hi"})
+    assert reply["ok"] is False and "stdout" in reply
+
+    assert request_daemon(sock_path, {"stop": True}) == {"ok": True}
+    worker.join(5)
+    assert not worker.is_alive() and not sock_path.exists()
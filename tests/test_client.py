@@ -0,0 +1,59 @@
+from xopt.client import XOptClient
+
+
+def test_tunable_reads_current_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    c = XOptClient(config_path=str(tmp_path / "missing.yaml"))
+    prompt = c.tunable("prompt")
+
+    assert prompt() == "Default prompt"
+
+    c.config = {
+        "xopt/a@0.1.0": {"tunables": {"prompt": "first"}},
+        "xopt/b@0.1.0": {"tunables": {"prompt": "second"}},
+    }
+    assert prompt() == "first"
+
+
+def test_list_installed_index_tracks_changes(tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    c = XOptClient(config_path=str(tmp_path / "missing.yaml"))
+
+    module_dir = c.modules_dir / "xopt_a"
+    module_dir.mkdir()
+    info = {"name": "xopt/a", "version": "0.1.0", "installed_at": str(module_dir)}
+    (module_dir / "install_info.json").write_text(json.dumps(info))
+
+    assert c.list_installed() == {"xopt/a": info}
+    assert (c.modules_dir / ".index.json").exists()
+
+    # Served from the index, which must still see an in-place rewrite
+    assert c.list_installed() == {"xopt/a": info}
+    info["version"] = "0.2.0"
+    (module_dir / "install_info.json").write_text(json.dumps(info))
+    installed = c.list_installed()
+    assert installed["xopt/a"]["version"] == "0.2.0"
+
+    # Callers get their own copy
+    installed["xopt/a"]["version"] = "MUT"
+    assert c.list_installed()["xopt/a"]["version"] == "0.2.0"
+
+
+def test_get_installed_reads_single_module(tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    c = XOptClient(config_path=str(tmp_path / "missing.yaml"))
+
+    module_dir = c.modules_dir / "xopt_a"
+    module_dir.mkdir()
+    info = {"name": "xopt/a", "version": "0.1.0", "installed_at": str(module_dir)}
+    (module_dir / "install_info.json").write_text(json.dumps(info))
+
+    assert c.is_installed("xopt/a")
+    assert c.get_installed("xopt/a") == info
+    assert not c.is_installed("xopt/b")
+    assert c.get_installed("xopt/b") is None
+    assert c.get_installed("xopt_a") is None
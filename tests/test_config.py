@@ -0,0 +1,46 @@
+import json
+import os
+
+from xopt.config import ModuleConfig, config_cache_path, load_module_config, sidecar_path
+
+
+def test_load_module_config_writes_cache_outside_tree(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config_path = tmp_path / "xopt.yaml"
+    config_path.write_text("name: xopt/test\nversion: 0.1.0\n")
+
+    assert load_module_config(config_path) == {"name": "xopt/test", "version": "0.1.0"}
+    assert json.loads(config_cache_path(config_path).read_text())["config"]["name"] == "xopt/test"
+    assert not sidecar_path(config_path).exists()
+
+
+def test_load_module_config_reparses_stale_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config_path = tmp_path / "xopt.yaml"
+    config_path.write_text("name: xopt/old\n")
+    load_module_config(config_path)
+
+    # Replaced by a file with an older mtime, as cp -p or rsync -a would leave it
+    config_path.write_text("name: xopt/new\n")
+    cache_mtime = config_cache_path(config_path).stat().st_mtime_ns
+    os.utime(config_path, ns=(cache_mtime - 10**9, cache_mtime - 10**9))
+
+    assert load_module_config(config_path) == {"name": "xopt/new"}
+
+
+def test_module_config_from_yaml_formats():
+    new = ModuleConfig.from_yaml({"name": "xopt/a", "version": "0.1.0", "tunables": {"p": 1}})
+    legacy = ModuleConfig.from_yaml({"xopt/a@0.1.0": {"configurables": {"tools": []}, "tunables": None}})
+
+    assert (new.tunables, new.configurables) == ({"p": 1}, {})
+    assert (legacy.tunables, legacy.configurables) == ({}, {"tools": []})
+
+
+def test_module_config_overrides_do_not_leak():
+    raw = {"tunables": {"p": 1}}
+    config = ModuleConfig.coerce(raw)
+    config.apply_overrides({"tunables": {"p": 2}, "configurables": {"c": 3}})
+
+    assert config.tunables == {"p": 2}
+    assert config.configurables == {"c": 3}
+    assert raw == {"tunables": {"p": 1}}
@@ -1,18 +1,50 @@
-from .models import Module, StepResult, Context
+import importlib
+
+# Bound eagerly: importing the xopt.client submodule later would otherwise
+# shadow the client() accessor with the module object
 from .client import XOptClient, client
-from .instance import ModuleInstance
-from .decorators import step, module
-from .registry import register
-from .utils import start, details
+
+# Everything else is imported on first attribute access (PEP 562), so that
+# e.g. the CLI doesn't pay for pydantic unless it needs it
+_LAZY = {
+    'Module': '.models',
+    'StepResult': '.models',
+    'Context': '.models',
+    'ModuleInstance': '.instance',
+    'step': '.decorators',
+    'module': '.decorators',
+    'register': '.registry',
+    'start': '.utils',
+    'details': '.utils',
+}
+
 
 # Import call_llm only when needed to avoid dependency issues
 def call_llm(*args, **kwargs):
     from .llm import call_llm as _call_llm
     return _call_llm(*args, **kwargs)
 
+def call_llm_stream(*args, **kwargs):
+    from .llm import call_llm_stream as _call_llm_stream
+    return _call_llm_stream(*args, **kwargs)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
 __all__ = [
     'Module',
-    'StepResult', 
+    'StepResult',
     'Context',
     'XOptClient',
     'client',
@@ -22,5 +54,6 @@ __all__ = [
     'register',
     'start',
     'details',
-    'call_llm'
+    'call_llm',
+    'call_llm_stream'
 ]
\ No newline at end of file
@@ -5,74 +5,134 @@ Command-line interface for xopt module management
 
 import argparse
 import sys
-from xopt.commands import (
-    cmd_package,
-    cmd_install,
-    cmd_uninstall,
-    cmd_list,
-    cmd_run,
-    cmd_dev_run,
-    cmd_init,
-    cmd_sync
-)
+from typing import Optional
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(description="xopt module management CLI")
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
+def _add_package(subparsers):
     # Package command
     package_parser = subparsers.add_parser("package", help="Package a module directory")
     package_parser.add_argument("module_dir", help="Directory containing the module")
     package_parser.add_argument("-o", "--output", help="Output package path")
-    package_parser.set_defaults(func=cmd_package)
-    
+    package_parser.add_argument("--compression", choices=["gzip", "zstd"], default="gzip",
+                                help="Archive compression; zstd is faster but needs 'zstandard' wherever the package is installed")
+    package_parser.set_defaults(handler="cmd_package")
+
+
+def _add_install(subparsers):
     # Install command
     install_parser = subparsers.add_parser("install", help="Install a module package or current directory")
     install_parser.add_argument("package", nargs="?", help="Path to .xopt package file (optional if in module directory)")
-    install_parser.set_defaults(func=cmd_install)
-    
+    install_parser.set_defaults(handler="cmd_install")
+
+
+def _add_uninstall(subparsers):
     # Uninstall command
     uninstall_parser = subparsers.add_parser("uninstall", help="Uninstall a module")
     uninstall_parser.add_argument("module", help="Module name to uninstall")
-    uninstall_parser.set_defaults(func=cmd_uninstall)
-    
+    uninstall_parser.set_defaults(handler="cmd_uninstall")
+
+
+def _add_list(subparsers):
     # List command
     list_parser = subparsers.add_parser("list", help="List installed modules")
-    list_parser.set_defaults(func=cmd_list)
-    
+    list_parser.set_defaults(handler="cmd_list")
+
+
+def _add_run(subparsers):
     # Run command
     run_parser = subparsers.add_parser("run", help="Run an installed module")
     run_parser.add_argument("module", help="Module name to run")
     run_parser.add_argument("input", help="Input data for the module")
     run_parser.add_argument("-c", "--config", help="JSON config overrides")
-    run_parser.set_defaults(func=cmd_run)
-    
+    run_parser.add_argument("--in-process", action="store_true", help="Run in this interpreter instead of the module's venv")
+    run_parser.set_defaults(handler="cmd_run")
+
+
+def _add_dev(subparsers):
     # Dev command
     dev_parser = subparsers.add_parser("dev", help="Run a module from development directory")
     dev_parser.add_argument("module_dir", help="Module directory path")
     dev_parser.add_argument("module", help="Module name")
     dev_parser.add_argument("input", help="Input data for the module")
     dev_parser.add_argument("-c", "--config", help="JSON config overrides")
-    dev_parser.set_defaults(func=cmd_dev_run)
-    
+    dev_parser.set_defaults(handler="cmd_dev_run")
+
+
+def _add_init(subparsers):
     # Init command
     init_parser = subparsers.add_parser("init", help="Initialize a new xopt project")
-    init_parser.set_defaults(func=cmd_init)
-    
-    # Sync command  
+    init_parser.set_defaults(handler="cmd_init")
+
+
+def _add_sync(subparsers):
+    # Sync command
     sync_parser = subparsers.add_parser("sync", help="Sync project dependencies")
-    sync_parser.set_defaults(func=cmd_sync)
-    
+    sync_parser.set_defaults(handler="cmd_sync")
+
+
+def _add_batch(subparsers):
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Run commands read as JSON lines from stdin")
+    batch_parser.set_defaults(handler="cmd_batch")
+
+
+def _add_daemon(subparsers):
+    # Daemon command
+    daemon_parser = subparsers.add_parser("daemon", help="Keep module runners warm to speed up `xopt run`")
+    daemon_parser.add_argument("modules", nargs="*", help="Modules to serve (default: all installed engines)")
+    daemon_parser.add_argument("--stop", action="store_true", help="Stop running daemons instead of starting them")
+    daemon_parser.set_defaults(handler="cmd_daemon")
+
+
+# Subparser builders by command name, in --help order
+_SUBPARSERS = {
+    "package": _add_package,
+    "install": _add_install,
+    "uninstall": _add_uninstall,
+    "list": _add_list,
+    "run": _add_run,
+    "dev": _add_dev,
+    "init": _add_init,
+    "sync": _add_sync,
+    "batch": _add_batch,
+    "daemon": _add_daemon,
+}
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the argument parser, with only `command`'s subparser if it is a known command"""
+    parser = argparse.ArgumentParser(description="xopt module management CLI")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    if command in _SUBPARSERS:
+        _SUBPARSERS[command](subparsers)
+    else:
+        # --help, no command or an unknown one - build everything for full usage/errors
+        for add_subparser in _SUBPARSERS.values():
+            add_subparser(subparsers)
+
+    return parser
+
+
+def dispatch(args: argparse.Namespace):
+    """Run the handler for a parsed command"""
+    # Command modules are only imported once we know which one is needed
+    import xopt.commands
+    getattr(xopt.commands, args.handler)(args)
+
+
+def main():
+    """Main CLI entry point"""
+    # The command is always the first argument, so only its subparser is needed
+    parser = build_parser(sys.argv[1] if len(sys.argv) > 1 else None)
     args = parser.parse_args()
-    
+
     if not args.command:
         parser.print_help()
         sys.exit(1)
-    
-    args.func(args)
+
+    dispatch(args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
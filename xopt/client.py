@@ -1,72 +1,154 @@
-from typing import Dict, Any, Callable, Optional
-import yaml
+from typing import Dict, Any, Callable, ClassVar, Optional, Set
 import os
-import subprocess
 import sys
-import tempfile
-import tarfile
-import json
 from pathlib import Path
 
+from .config import (
+    ModuleConfig, dump_json, json_snapshot, load_json, load_module_config, load_yaml, sidecar_path, write_json_cache
+)
+
+# Venv subdirectory holding the interpreter on this platform
+_VENV_BIN = "Scripts" if os.name == "nt" else "bin"
+
+# Pre-parsed xopt.yaml written into packages so install can skip YAML
+_MANIFEST_NAME = "xopt.manifest.json"
+
+# Frame magic number that starts every zstd-compressed package
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _optional_module(name: str):
+    """Import an optional accelerator module, or None if it isn't installed"""
+    import importlib
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _extract_all(tar, dest: Path):
+    """Extract a streamed tar archive, skipping unsafe members where supported"""
+    import tarfile
+    if not hasattr(tarfile, "data_filter"):
+        tar.extractall(dest)
+        return
+    
+    def skip_unsafe(member, dest_path):
+        try:
+            return tarfile.data_filter(member, dest_path)
+        except tarfile.FilterError:
+            # Links outside the module (e.g. a bundled venv's python -> /usr/bin/python3)
+            # are dropped rather than failing the whole install
+            return None
+    
+    tar.extractall(dest, filter=skip_unsafe)
+
 
 class XOptClient:
     """Client for managing xopt configuration and modules"""
     
+    # Modules directories already created in this process, shared by all clients
+    _dirs_ensured: ClassVar[Set[Path]] = set()
+    
     def __init__(self, config_path: str = "xopt.yaml"):
         self.config_path = config_path
-        self.config = self._load_config()
+        # xopt.yaml is parsed on first use; most CLI commands never need it
+        self._config_loaded = False
+        self._tunable_getters = {}
         self._modules = {}
         self._instances = {}
-        self.modules_dir = Path.home() / ".xopt" / "modules"
-        self.modules_dir.mkdir(parents=True, exist_ok=True)
+        self._modules_dir = Path.home() / ".xopt" / "modules"
+    
+    @property
+    def modules_dir(self) -> Path:
+        """Directory holding installed modules, created on first access"""
+        if self._modules_dir not in XOptClient._dirs_ensured:
+            self._modules_dir.mkdir(parents=True, exist_ok=True)
+            XOptClient._dirs_ensured.add(self._modules_dir)
+        return self._modules_dir
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Module configuration, keyed by module spec"""
+        if not self._config_loaded:
+            self.config = self._load_config()
+        return self._config
+    
+    @config.setter
+    def config(self, value: Dict[str, Any]):
+        self._config = value
+        self._config_loaded = True
+        # Index module configs by spec and flatten tunables so lookups don't scan every module
+        self._module_configs = {
+            spec: ModuleConfig.coerce(module_config)
+            for spec, module_config in (value or {}).items()
+            if isinstance(module_config, (dict, ModuleConfig))
+        }
+        # First module wins, matching a scan in config order
+        self._tunable_index = {}
+        self._configurable_index = {}
+        for module_config in self._module_configs.values():
+            for name, tunable_value in module_config.tunables.items():
+                self._tunable_index.setdefault(name, tunable_value)
+            for name, configurable_value in module_config.configurables.items():
+                self._configurable_index.setdefault(name, configurable_value)
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from xopt.yaml"""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+            # Warm runs read a JSON cache (kept under ~/.xopt) instead of re-parsing the YAML
+            return load_module_config(self.config_path)
         return {}
     
     def tunable(self, name: str, description: str = "") -> Callable:
         """Create a tunable parameter that reads from config"""
+        # One getter per name, so repeated declarations share it
+        if name in self._tunable_getters:
+            return self._tunable_getters[name]
+        
         def get_tunable_value():
-            # Find the tunable value in config
-            for module_config in self.config.values():
-                if 'tunables' in module_config and name in module_config['tunables']:
-                    return module_config['tunables'][name]
-            return f"Default {name}"
+            # Resolved on each call so config reassignment is picked up
+            if not self._config_loaded:
+                self.config = self._load_config()
+            return self._tunable_index.get(name, f"Default {name}")
         
+        self._tunable_getters[name] = get_tunable_value
         return get_tunable_value
     
     def configurable(self, name: str, description: str = "") -> Any:
         """Create a configurable parameter that reads from config"""
-        # Find the configurable value in config
-        for config_key, module_config in self.config.items():
-            if 'configurables' in module_config and name in module_config['configurables']:
-                return module_config['configurables'][name]
-        return []
+        if not self._config_loaded:
+            self.config = self._load_config()
+        return self._configurable_index.get(name, [])
     
-    def package(self, module_dir: str, output_path: Optional[str] = None, output_dir: Optional[str] = None) -> str:
-        """Package a module directory into a .xopt archive"""
+    def package(self, module_dir: str, output_path: Optional[str] = None, output_dir: Optional[str] = None,
+                compression: str = "gzip") -> str:
+        """Package a module directory into a .xopt archive (gzip, or zstd when asked for)"""
         module_path = Path(module_dir)
         if not module_path.exists():
             raise ValueError(f"Module directory {module_dir} does not exist")
         
+        # zstd packages only install where zstandard is available, so they are opt-in
+        if compression not in ("gzip", "zstd"):
+            raise ValueError(f"Unknown compression '{compression}' (expected gzip or zstd)")
+        zstd = _optional_module("zstandard") if compression == "zstd" else None
+        if compression == "zstd" and zstd is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        
         # Load module metadata
         if (module_path / "xopt.yaml").exists():
-            with open(module_path / "xopt.yaml") as f:
-                config = yaml.safe_load(f)
-                
-                # Handle new schema format
-                if 'name' in config and 'version' in config:
-                    module_name = config['name']
-                    version = config['version']
-                    engine = config.get('engine')
-                else:
-                    # Handle legacy format for backwards compatibility
-                    module_name = list(config.keys())[0].split("@")[0]
-                    version = list(config.keys())[0].split("@")[1]
-                    engine = None
+            config = load_yaml(module_path / "xopt.yaml")
+            
+            # Handle new schema format
+            if 'name' in config and 'version' in config:
+                module_name = config['name']
+                version = config['version']
+                engine = config.get('engine')
+            else:
+                # Handle legacy format for backwards compatibility
+                module_name = list(config.keys())[0].split("@")[0]
+                version = list(config.keys())[0].split("@")[1]
+                engine = None
         else:
             raise ValueError("Module must have xopt.yaml file")
         
@@ -82,16 +164,36 @@ class XOptClient:
         # For engine references, validate the referenced engine exists
         if engine and not engine.startswith("./"):
             # This is an engine reference - validate it exists in installed modules
-            installed = self.list_installed()
             engine_name = engine.split("@")[0] if "@" in engine else engine
-            if engine_name not in installed:
+            if not self.is_installed(engine_name):
                 print(f"⚠️  Warning: Referenced engine '{engine}' is not installed")
                 print(f"   Make sure to install the base engine before using this module")
         
         # Create package archive
-        with tarfile.open(output_path, "w:gz") as tar:
-            # Add all module files
-            tar.add(module_path, arcname=".")
+        import io
+        import tarfile
+        skipped = {sidecar_path(module_path / "xopt.yaml").name, _MANIFEST_NAME}
+        # Configs that don't survive JSON are left for install to parse from YAML
+        manifest = json_snapshot({"name": module_name, "version": version, "engine": engine, "config": config})
+        
+        def add_files(tar):
+            # Add all module files, skipping the local parse cache and any stale manifest
+            tar.add(module_path, arcname=".",
+                    filter=lambda info: None if Path(info.name).name in skipped else info)
+            if manifest is not None:
+                info = tarfile.TarInfo(f"./{_MANIFEST_NAME}")
+                info.size = len(manifest)
+                tar.addfile(info, io.BytesIO(manifest))
+        
+        if zstd is not None:
+            # zstd compresses and decompresses much faster than gzip at a similar ratio
+            with open(output_path, "wb") as f, \
+                    zstd.ZstdCompressor(level=3, threads=-1).stream_writer(f) as writer, \
+                    tarfile.open(fileobj=writer, mode="w|") as tar:
+                add_files(tar)
+        else:
+            with tarfile.open(output_path, "w:gz") as tar:
+                add_files(tar)
         
         print(f"📦 Packaged {module_name}@{version} to {output_path}")
         if engine and not engine.startswith("./"):
@@ -106,57 +208,101 @@ class XOptClient:
         if not package_path.exists():
             raise ValueError(f"Package {package_path} does not exist")
         
-        # Create temporary directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Extract package
-            with tarfile.open(package_path, "r:gz") as tar:
-                tar.extractall(temp_path)
+        import tarfile
+        
+        def extract(staging_path: Path):
+            # Extract package - zstd if packaged with zstandard available, else gzip
+            with open(package_path, "rb") as f:
+                magic = f.read(len(_ZSTD_MAGIC))
+            if magic == _ZSTD_MAGIC:
+                zstd = _optional_module("zstandard")
+                if zstd is None:
+                    raise ValueError(f"Package {package_path} is zstd-compressed; install 'zstandard' to install it")
+                with open(package_path, "rb") as f, \
+                        zstd.ZstdDecompressor().stream_reader(f) as reader, \
+                        tarfile.open(fileobj=reader, mode="r|") as tar:
+                    _extract_all(tar, staging_path)
+            else:
+                rapidgzip = _optional_module("rapidgzip")
+                if rapidgzip is not None:
+                    # Decompress on every core instead of zlib's single thread
+                    with rapidgzip.open(str(package_path), parallelization=os.cpu_count() or 1) as f, \
+                            tarfile.open(fileobj=f, mode="r|") as tar:
+                        _extract_all(tar, staging_path)
+                else:
+                    # Single sequential pass over the archive with a large read buffer
+                    with tarfile.open(package_path, "r|gz", bufsize=1 << 20) as tar:
+                        _extract_all(tar, staging_path)
+        
+        return self._install_staged(extract)
+    
+    def install_dir(self, module_dir: str) -> str:
+        """Install a module directly from its source directory, without packaging it"""
+        module_path = Path(module_dir)
+        if not (module_path / "xopt.yaml").exists():
+            raise ValueError("Module must have xopt.yaml file")
+        
+        import shutil
+        
+        # Same files package() would include
+        skipped = {sidecar_path(module_path / "xopt.yaml").name, _MANIFEST_NAME}
+        
+        def copy(staging_path: Path):
+            shutil.copytree(module_path, staging_path, symlinks=True, dirs_exist_ok=True,
+                            ignore=lambda _, names: [name for name in names if name in skipped])
+        
+        return self._install_staged(copy)
+    
+    def _install_staged(self, populate: Callable[[Path], None]) -> str:
+        """Fill a staging directory with module files, then install it with its virtual environment"""
+        import shutil
+        import subprocess
+        import tempfile
+        
+        # Stage next to the final location so installing is a rename, not a copy
+        staging_path = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.modules_dir))
+        try:
+            populate(staging_path)
             
             # Load module metadata
-            config_path = temp_path / "xopt.yaml"
+            config_path = staging_path / "xopt.yaml"
             if not config_path.exists():
                 raise ValueError("Package missing xopt.yaml")
             
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-                
-                # Handle new schema format
-                if 'name' in config and 'version' in config:
-                    module_name = config['name']
-                    version = config['version']
-                    engine = config.get('engine')
-                else:
-                    # Handle legacy format for backwards compatibility
-                    module_spec = list(config.keys())[0]
-                    module_name = module_spec.split("@")[0]
-                    version = module_spec.split("@")[1]
-                    engine = None
+            # Packages from older versions have no manifest
+            manifest_path = staging_path / _MANIFEST_NAME
+            if manifest_path.exists():
+                config = load_json(manifest_path)["config"]
+            else:
+                config = load_yaml(config_path)
+            
+            # Handle new schema format
+            if 'name' in config and 'version' in config:
+                module_name = config['name']
+                version = config['version']
+                engine = config.get('engine')
+            else:
+                # Handle legacy format for backwards compatibility
+                module_spec = list(config.keys())[0]
+                module_name = module_spec.split("@")[0]
+                version = module_spec.split("@")[1]
+                engine = None
             
             # Create module directory
             module_dir = self.modules_dir / module_name.replace("/", "_")
             if module_dir.exists():
                 print(f"⚠️  Module {module_name} already installed, removing old version")
-                import shutil
+                self._stop_daemon(module_dir)
                 shutil.rmtree(module_dir)
             
-            module_dir.mkdir(parents=True)
-            
-            # Copy module files
-            import shutil
-            for item in temp_path.iterdir():
-                if item.is_dir():
-                    shutil.copytree(item, module_dir / item.name)
-                else:
-                    shutil.copy2(item, module_dir / item.name)
+            # Move the extracted files into place
+            os.rename(staging_path, module_dir)
             
             # Handle engine references vs local engines
             if engine and not engine.startswith("./"):
                 # This is an engine reference - validate base engine exists
-                installed = self.list_installed()
                 engine_name = engine.split("@")[0] if "@" in engine else engine
-                if engine_name not in installed:
+                if not self.is_installed(engine_name):
                     raise ValueError(f"Referenced engine '{engine}' is not installed. Install it first.")
                 
                 print(f"🔗 Module references engine: {engine}")
@@ -174,13 +320,22 @@ class XOptClient:
                 print(f"🐍 Creating virtual environment at {venv_path}")
                 # Try python3 first, then python
                 python_cmd = "python3"
-                subprocess.run([python_cmd, "-m", "venv", str(venv_path)], check=True)
+                # uv creates venvs and installs packages much faster than venv + pip when it's on PATH
+                uv = shutil.which("uv")
+                if uv:
+                    subprocess.run([uv, "venv", "--quiet", "--python", python_cmd, str(venv_path)], check=True)
+                else:
+                    subprocess.run([python_cmd, "-m", "venv", str(venv_path)], check=True)
+                venv_python = venv_path / _VENV_BIN / "python"
                 
                 # Install dependencies
                 if (module_dir / "pyproject.toml").exists() or (module_dir / "requirements.txt").exists():
-                    venv_python = venv_path / ("Scripts" if os.name == "nt" else "bin") / "python"
-                    
-                    # Install xopt in the venv first
+                    # xopt and the module's dependencies go into a single pip run,
+                    # so the venv's interpreter and pip start up (and resolve) once
+                    if uv:
+                        pip_cmd = [uv, "pip", "install", "--python", str(venv_python)]
+                    else:
+                        pip_cmd = [str(venv_python), "-m", "pip", "install", "--no-compile", "--disable-pip-version-check"]
                     print("📦 Installing xopt in module environment")
                     
                     # Try to determine if we're in a development environment or installed
@@ -190,21 +345,24 @@ class XOptClient:
                     # Check if we can find the development version with the fix
                     if (dev_path.exists() and (dev_path / "pyproject.toml").exists()):
                         # Development environment available - install in editable mode with fix
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "-e", str(dev_path)], check=True)
+                        pip_cmd += ["-e", str(dev_path)]
                     elif (xopt_source_path / "pyproject.toml").exists():
                         # Fallback to detected source path
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "-e", str(xopt_source_path)], check=True)
+                        pip_cmd += ["-e", str(xopt_source_path)]
                     else:
                         # Installed environment - install from PyPI
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "xoptpy"], check=True)
+                        pip_cmd.append("xoptpy")
                     
                     # Install module dependencies
                     if (module_dir / "pyproject.toml").exists():
                         print("📦 Installing module dependencies from pyproject.toml")
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "-e", str(module_dir)], check=True)
+                        pip_cmd += ["-e", str(module_dir)]
                     else:
                         print("📦 Installing module dependencies from requirements.txt")
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "-r", str(module_dir / "requirements.txt")], check=True)
+                        pip_cmd += ["-r", str(module_dir / "requirements.txt")]
+                    
+                    pip_env = {**os.environ, "PIP_NO_INPUT": "1", "PYTHONDONTWRITEBYTECODE": "1"}
+                    subprocess.run(pip_cmd, check=True, env=pip_env)
                 
                 # Handle config format for backwards compatibility
                 if 'name' in config:
@@ -218,34 +376,86 @@ class XOptClient:
                     "installed_at": str(module_dir),
                     "type": "local_engine",
                     "engine": engine,
+                    # Recorded so runs don't rebuild the path
+                    "venv_python": str(venv_python),
+                    # Declared in xopt.yaml by modules whose deps the host interpreter already has
+                    "in_process": bool(isinstance(config_data, dict) and config_data.get("in_process")),
                     "config": config_data
                 }
             
-            with open(module_dir / "install_info.json", "w") as f:
-                json.dump(install_info, f, indent=2)
+            dump_json(module_dir / "install_info.json", install_info, indent=True)
             
             print(f"✅ Installed {module_name}@{version} to {module_dir}")
             return module_name
+        
+        finally:
+            # Only left behind if installation failed before the rename
+            if staging_path.exists():
+                shutil.rmtree(staging_path, ignore_errors=True)
     
     def list_installed(self) -> Dict[str, Dict[str, Any]]:
         """List all installed modules"""
-        installed = {}
+        # Stamp every install_info.json by (mtime, size) in one directory scan;
+        # if nothing changed since the index was written, skip reading them
+        stamp = []
+        with os.scandir(self.modules_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    try:
+                        st = os.stat(os.path.join(entry.path, "install_info.json"))
+                    except OSError:
+                        continue
+                    stamp.append([entry.name, st.st_mtime_ns, st.st_size])
+        stamp.sort()
+        
+        index_path = self.modules_dir / ".index.json"
+        try:
+            index = load_json(index_path)
+            if index["stamp"] == stamp:
+                return index["modules"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or corrupt index - rebuild it
+            pass
         
-        for module_path in self.modules_dir.iterdir():
-            if module_path.is_dir():
-                install_info_path = module_path / "install_info.json"
-                if install_info_path.exists():
-                    with open(install_info_path) as f:
-                        info = json.load(f)
-                        installed[info["name"]] = info
+        installed = {}
+        for dir_name, _, _ in stamp:
+            info = load_json(self.modules_dir / dir_name / "install_info.json")
+            installed[info["name"]] = info
         
+        write_json_cache(index_path, {"stamp": stamp, "modules": installed})
         return installed
     
+    def _install_info_path(self, module_name: str) -> Path:
+        return self.modules_dir / module_name.replace("/", "_") / "install_info.json"
+    
+    def is_installed(self, module_name: str) -> bool:
+        """Check whether a module is installed, reading only its own install info"""
+        return self.get_installed(module_name) is not None
+    
+    def get_installed(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """Get one installed module's info without reading every module's"""
+        try:
+            info = load_json(self._install_info_path(module_name))
+        except FileNotFoundError:
+            return None
+        # Directory names flatten "/" to "_", so "xopt_react" would otherwise find "xopt/react"
+        return info if info.get("name") == module_name else None
+    
+    def _stop_daemon(self, module_dir: Path):
+        """Stop an `xopt daemon` worker serving from a module directory that is about to be removed"""
+        from .runner import DAEMON_SOCKET, request_daemon
+        try:
+            request_daemon(module_dir / DAEMON_SOCKET, {"stop": True})
+        except RuntimeError:
+            # Died while stopping - either way it is gone
+            pass
+    
     def uninstall(self, module_name: str) -> bool:
         """Uninstall a module"""
         module_dir = self.modules_dir / module_name.replace("/", "_")
         if module_dir.exists():
             import shutil
+            self._stop_daemon(module_dir)
             shutil.rmtree(module_dir)
             print(f"🗑️  Uninstalled {module_name}")
             return True
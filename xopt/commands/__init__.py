@@ -2,22 +2,45 @@
 Command modules for xopt CLI
 """
 
-from .package import cmd_package
-from .install import cmd_install
-from .uninstall import cmd_uninstall
-from .list import cmd_list
-from .run import cmd_run
-from .dev import cmd_dev_run
-from .init import cmd_init
-from .sync import cmd_sync
+import importlib
+
+# Handler name -> submodule; each is imported on first access (PEP 562)
+# so a CLI invocation only loads the command it runs
+_HANDLERS = {
+    'cmd_package': '.package',
+    'cmd_install': '.install',
+    'cmd_uninstall': '.uninstall',
+    'cmd_list': '.list',
+    'cmd_run': '.run',
+    'cmd_dev_run': '.dev',
+    'cmd_init': '.init',
+    'cmd_sync': '.sync',
+    'cmd_batch': '.batch',
+    'cmd_daemon': '.daemon',
+}
+
+
+def __getattr__(name):
+    if name not in _HANDLERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    handler = getattr(importlib.import_module(_HANDLERS[name], __name__), name)
+    globals()[name] = handler
+    return handler
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_HANDLERS))
+
 
 __all__ = [
     'cmd_package',
-    'cmd_install', 
+    'cmd_install',
     'cmd_uninstall',
     'cmd_list',
     'cmd_run',
     'cmd_dev_run',
     'cmd_init',
-    'cmd_sync'
+    'cmd_sync',
+    'cmd_batch',
+    'cmd_daemon'
 ]
\ No newline at end of file
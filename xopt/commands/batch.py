@@ -0,0 +1,82 @@
+"""Batch command for xopt CLI"""
+
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+
+def _exit_code(code) -> int:
+    """Map a SystemExit code to a process return code"""
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+@contextmanager
+def _reply_stream():
+    """Yield a stream for JSON replies, with stdout's fd pointed at stderr meanwhile
+
+    redirect_stdout only captures Python-level writes; child processes
+    (pip, venv creation) write to fd 1 directly and must not end up in
+    the JSON-lines stream.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Not backed by a file descriptor (e.g. already captured in-process)
+        yield sys.stdout
+        return
+
+    sys.stdout.flush()
+    replies = os.fdopen(os.dup(fd), "w", encoding=sys.stdout.encoding)
+    os.dup2(sys.stderr.fileno(), fd)
+    try:
+        yield replies
+    finally:
+        replies.flush()
+        os.dup2(replies.fileno(), fd)
+        replies.close()
+
+
+def cmd_batch(args):
+    """Run xopt commands from stdin in a single process
+
+    Each input line is a JSON object like {"argv": ["list"]}; for each one a
+    JSON line {"rc": ..., "stdout": ..., "stderr": ...} is written to stdout.
+    """
+    from xopt.cli import build_parser, dispatch
+
+    parser = build_parser()
+    with _reply_stream() as replies:
+        _run_lines(parser, dispatch, replies)
+
+
+def _run_lines(parser, dispatch, replies):
+    """Run each JSON command line from stdin, writing one JSON reply per line"""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        rc = 0
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                command_args = parser.parse_args(json.loads(line)["argv"])
+                if not command_args.command:
+                    parser.print_help()
+                    rc = 1
+                elif command_args.command == "batch":
+                    print("Error: batch commands cannot be nested", file=sys.stderr)
+                    rc = 1
+                else:
+                    dispatch(command_args)
+            except SystemExit as e:
+                rc = _exit_code(e.code)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                rc = 1
+
+        replies.write(json.dumps({"rc": rc, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}) + "\n")
+        replies.flush()
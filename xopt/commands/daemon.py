@@ -0,0 +1,88 @@
+"""Daemon command for xopt CLI"""
+
+import sys
+import subprocess
+import socket
+import time
+from pathlib import Path
+from xopt.client import client
+from xopt.runner import DAEMON_SOCKET, request_daemon
+from .run import engine_info, venv_python
+
+# Seconds a new worker gets to import xopt and start answering
+_START_TIMEOUT = 15.0
+
+# Worker stderr, kept in the engine's install dir so failed starts can be diagnosed
+DAEMON_LOG = "daemon.log"
+
+
+def _wait_until_up(worker: subprocess.Popen, sock_path: Path) -> bool:
+    """Poll a newly started worker until it answers a ping, exits, or runs out of time"""
+    deadline = time.monotonic() + _START_TIMEOUT
+    while time.monotonic() < deadline:
+        if request_daemon(sock_path, {}) is not None:
+            return True
+        if worker.poll() is not None:
+            return False
+        time.sleep(0.1)
+    return False
+
+
+def cmd_daemon(args):
+    """Start (or stop) persistent runner processes that serve `xopt run`"""
+    try:
+        if not hasattr(socket, "AF_UNIX"):
+            print("xopt daemon requires unix domain sockets", file=sys.stderr)
+            sys.exit(1)
+
+        modules = args.modules
+        if not modules:
+            # Default to every local engine - engine references share their engine's daemon
+            modules = [name for name, info in client().list_installed().items()
+                       if info.get("type") != "engine_reference"]
+
+        # Engine references resolve to their engine, so start each venv's worker once
+        failed = False
+        engines = {}
+        for module_name in modules:
+            info = engine_info(module_name)
+            engines.setdefault(info["installed_at"], (module_name, info))
+
+        for module_name, info in engines.values():
+            run_dir = Path(info["installed_at"])
+            sock_path = run_dir / DAEMON_SOCKET
+
+            if args.stop:
+                if request_daemon(sock_path, {"stop": True}) is not None:
+                    print(f"🛑 Stopped daemon for {module_name}")
+                continue
+
+            if request_daemon(sock_path, {}) is not None:
+                print(f"✅ Daemon for {module_name} already running")
+                continue
+
+            log_path = run_dir / DAEMON_LOG
+            with open(log_path, "ab") as log:
+                worker = subprocess.Popen(
+                    [venv_python(info), "-m", "xopt.runner", "--serve", str(sock_path)],
+                    cwd=str(run_dir),
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=log,
+                    start_new_session=True
+                )
+            
+            if _wait_until_up(worker, sock_path):
+                print(f"🚀 Started daemon for {module_name} at {sock_path}")
+            else:
+                if worker.poll() is None:
+                    worker.kill()
+                print(f"❌ Daemon for {module_name} failed to start (see {log_path})", file=sys.stderr)
+                failed = True
+
+        if failed:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"Error managing daemon: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -1,9 +1,9 @@
 """Dev command for xopt CLI"""
 
 import sys
-import subprocess
 import os
 from pathlib import Path
+from .run import run_child
 
 
 def cmd_dev_run(args):
@@ -41,12 +41,8 @@ def cmd_dev_run(args):
             if args.config:
                 cmd.extend(["--config", args.config])
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print(result.stdout.strip())
-            else:
-                print(f"Error running module: {result.stderr}", file=sys.stderr)
+            # The runner reports its own errors on stderr
+            if run_child(cmd) != 0:
                 sys.exit(1)
     
     except Exception as e:
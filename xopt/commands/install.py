@@ -1,7 +1,6 @@
 """Install command for xopt CLI"""
 
 import sys
-import tempfile
 from pathlib import Path
 from xopt.client import client
 
@@ -14,7 +13,7 @@ def cmd_install(args):
             module_name = client().install(args.package)
             print(f"Module {module_name} installed successfully")
         else:
-            # Directory mode: package current directory and install
+            # Directory mode: install current directory in place of a package
             current_dir = Path(".")
             
             # Check if current directory has xopt.yaml
@@ -22,19 +21,11 @@ def cmd_install(args):
                 print("No xopt.yaml found in current directory. Either provide a .xopt file or run in a module directory.", file=sys.stderr)
                 sys.exit(1)
             
-            print("📦 Packaging current directory...")
+            print("🔧 Installing current directory to local package manager...")
             
-            # Package to a temporary location
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Package the current directory
-                package_path = client().package(str(current_dir), output_dir=temp_dir)
-                
-                print(f"✅ Package created: {Path(package_path).name}")
-                print("🔧 Installing to local package manager...")
-                
-                # Install the package
-                module_name = client().install(package_path)
-                print(f"🎉 Module {module_name} installed successfully")
+            # Files are copied straight in - no compress/extract round trip
+            module_name = client().install_dir(str(current_dir))
+            print(f"🎉 Module {module_name} installed successfully")
                 
     except Exception as e:
         print(e)
@@ -7,7 +7,7 @@ from xopt.client import client
 def cmd_package(args):
     """Package a module directory"""
     try:
-        output_path = client().package(args.module_dir, args.output)
+        output_path = client().package(args.module_dir, args.output, compression=args.compression)
         print(f"Package created: {output_path}")
     except Exception as e:
         print(e)
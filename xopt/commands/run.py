@@ -3,58 +3,92 @@
 import sys
 import subprocess
 import os
+import json
 from pathlib import Path
+from typing import Any, Dict
 from xopt.client import client
+from xopt.runner import DAEMON_SOCKET, request_daemon, run_installed_module
+
+# Venv subdirectory holding the interpreter on this platform
+_VENV_BIN = "Scripts" if os.name == "nt" else "bin"
+
+
+def run_child(cmd, cwd=None) -> int:
+    """Run a child command, streaming its output; returns the exit code"""
+    if sys.stdout is sys.__stdout__ and sys.stderr is sys.__stderr__:
+        # Let the child write straight to our stdout/stderr - no pipes to drain
+        return subprocess.run(cmd, cwd=cwd).returncode
+    
+    # Output is being redirected in-process (e.g. by `xopt batch`), so relay it
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    return result.returncode
+
+
+def engine_info(module_name: str) -> Dict[str, Any]:
+    """Get the install info of the module whose venv runs a module (its engine's, for engine references)"""
+    # Only this module's (and its engine's) info is read
+    module_info = client().get_installed(module_name)
+    if module_info is None:
+        print(f"Module {module_name} is not installed", file=sys.stderr)
+        sys.exit(1)
+    
+    # For engine reference modules, use the engine's environment
+    if module_info.get("type") == "engine_reference":
+        engine = module_info.get("engine")
+        engine_name = engine.split("@")[0] if "@" in engine else engine
+        base_info = client().get_installed(engine_name)
+        if base_info is None:
+            print(f"Referenced engine {engine_name} not installed", file=sys.stderr)
+            sys.exit(1)
+        return base_info
+    
+    return module_info
+
+
+def venv_python(info: Dict[str, Any]) -> str:
+    """Get an installed engine's venv interpreter"""
+    # Modules installed before the path was recorded fall back to building it
+    return info.get("venv_python") or str(Path(info["installed_at"]) / "venv" / _VENV_BIN / "python")
 
 
 def cmd_run(args):
     """Run an installed module"""
     try:
-        # Find installed module
-        installed = client().list_installed()
-        if args.module not in installed:
-            print(f"Module {args.module} is not installed", file=sys.stderr)
-            sys.exit(1)
-        
-        module_info = installed[args.module]
+        info = engine_info(args.module)
+        module_dir = Path(info["installed_at"])
         
-        # For engine reference modules, use the engine's environment
-        if module_info.get("type") == "engine_reference":
-            engine = module_info.get("engine")
-            engine_name = engine.split("@")[0] if "@" in engine else engine
-            if engine_name not in installed:
-                print(f"Referenced engine {engine_name} not installed", file=sys.stderr)
+        # A warm `xopt daemon` worker skips starting a new interpreter; no reply
+        # timeout, since a run takes as long as the module does
+        reply = request_daemon(module_dir / DAEMON_SOCKET, {"module": args.module, "input": args.input, "config": args.config}, timeout=None)
+        if reply is not None:
+            sys.stdout.write(reply.get("stdout", ""))
+            sys.stderr.write(reply.get("stderr", ""))
+            if not reply.get("ok"):
+                print(f"Error: {reply.get('error')}", file=sys.stderr)
                 sys.exit(1)
-            engine_info = installed[engine_name]
-            module_dir = Path(engine_info["installed_at"])
-        else:
-            module_dir = Path(module_info["installed_at"])
-            
-        venv_python = module_dir / "venv" / ("Scripts" if os.name == "nt" else "bin") / "python"
+            print(reply["output"])
+            return
         
-        # Prepare config overrides
-        config_json = None
-        if args.config:
-            config_json = args.config
+        # Skip starting another interpreter when asked to (--in-process, or `in_process: true`
+        # in the engine's xopt.yaml), or when this one already is the engine's venv
+        if args.in_process or info.get("in_process") or Path(venv_python(info)) == Path(sys.executable):
+            try:
+                config_overrides = json.loads(args.config) if args.config else None
+                print(run_installed_module(args.module, args.input, config_overrides))
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            return
         
         # Build command
-        cmd = [str(venv_python), "-m", "xopt.runner", "--module", args.module, "--input", args.input]
-        if config_json:
-            cmd.extend(["--config", config_json])
-        
-        # For engine reference modules, run from engine directory
-        if module_info.get("type") == "engine_reference":
-            run_dir = module_dir  # Engine module directory
-        else:
-            run_dir = module_dir
-            
-        # Run in module's virtual environment
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(run_dir))
+        cmd = [venv_python(info), "-m", "xopt.runner", "--module", args.module, "--input", args.input]
+        if args.config:
+            cmd.extend(["--config", args.config])
         
-        if result.returncode == 0:
-            print(result.stdout.strip())
-        else:
-            print(f"Error running module: {result.stderr}", file=sys.stderr)
+        # Run in module's virtual environment; the runner reports its own errors on stderr
+        if run_child(cmd, cwd=str(module_dir)) != 0:
             sys.exit(1)
     
     except Exception as e:
@@ -1,9 +1,34 @@
 """Sync command for xopt CLI"""
 
 import sys
-import toml
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from xopt.client import client
+from xopt.config import load_toml, load_yaml
+
+# Keeps status lines from concurrent installs from interleaving
+_print_lock = threading.Lock()
+
+
+def _references_engine(source_path: Path) -> bool:
+    """Check whether a module source references an engine that must be installed first"""
+    config_path = source_path / "xopt.yaml"
+    if not config_path.exists():
+        return False
+    config = load_yaml(config_path)
+    engine = config.get("engine") if isinstance(config, dict) else None
+    return bool(engine) and not engine.startswith("./")
+
+
+def _package_and_install(module_name: str, source_path: Path):
+    """Package a module from its source directory and install it"""
+    with _print_lock:
+        print(f"📦 Packaging {module_name} from {source_path}")
+    package_path = client().package(str(source_path))
+    with _print_lock:
+        print(f"📥 Installing {module_name}")
+    client().install(package_path)
 
 
 def cmd_sync(args):
@@ -17,12 +42,13 @@ def cmd_sync(args):
             sys.exit(1)
         
         # Load dependencies
-        deps = toml.load(deps_file)
+        deps = load_toml(deps_file)
         modules = deps.get("modules", {})
         sources = deps.get("sources", {})
         
         installed = client().list_installed()
         
+        to_install = []
         for module_name, version in modules.items():
             if module_name in installed:
                 print(f"✅ {module_name}@{version} already installed")
@@ -34,15 +60,39 @@ def cmd_sync(args):
                 if "path" in source_info:
                     source_path = Path(source_info["path"])
                     if source_path.exists():
-                        print(f"📦 Packaging {module_name} from {source_path}")
-                        package_path = client().package(str(source_path))
-                        print(f"📥 Installing {module_name}")
-                        client().install(package_path)
+                        to_install.append((module_name, source_path))
                         continue
             
             print(f"❌ Module {module_name}@{version} not found locally")
             print(f"   Add to sources in deps.toml or provide .xopt package")
         
+        # Engine references need their engine installed first, so local engines go in an
+        # earlier wave; modules within a wave are independent and installed concurrently
+        engines, references = [], []
+        for module_name, source_path in to_install:
+            wave = references if _references_engine(source_path) else engines
+            wave.append((module_name, source_path))
+        
+        failed = False
+        for wave in (engines, references):
+            if not wave:
+                continue
+            with ThreadPoolExecutor(max_workers=min(8, len(wave))) as executor:
+                futures = {
+                    executor.submit(_package_and_install, module_name, source_path): module_name
+                    for module_name, source_path in wave
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed = True
+                        with _print_lock:
+                            print(f"❌ Failed to install {futures[future]}: {e}", file=sys.stderr)
+        
+        if failed:
+            sys.exit(1)
+        
         print("\n🎉 Sync complete!")
         
     except Exception as e:
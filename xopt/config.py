@@ -0,0 +1,181 @@
+"""
+Helpers for loading xopt module configuration files
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import functools
+import json
+import os
+import tempfile
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """Import the optional orjson module once, or None if it isn't installed"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _dumps(value: Any, indent: bool = False) -> bytes:
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(value, indent=2 if indent else None).encode()
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Read a JSON file, with orjson when it is installed"""
+    with open(path, "rb") as f:
+        data = f.read()
+    orjson = _orjson()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dump_json(path: Union[str, Path], value: Any, indent: bool = False) -> None:
+    """Write a JSON file, with orjson when it is installed"""
+    with open(path, "wb") as f:
+        f.write(_dumps(value, indent))
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """Parse a YAML file using the fastest available safe loader"""
+    # Imported here so commands that never read YAML don't pay for PyYAML
+    import yaml
+    
+    # Prefer the libyaml-backed parser when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+
+def load_toml(path: Union[str, Path]) -> Any:
+    """Parse a TOML file using the fastest available parser"""
+    # tomllib is stdlib from 3.11 and tomli is its backport; the pure-Python toml package is the last resort
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            import toml
+            return toml.load(path)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def sidecar_path(path: Union[str, Path]) -> Path:
+    """Get the legacy in-tree cache path for a YAML config (xopt.yaml -> .xopt.yaml.json)"""
+    # No longer written, but older versions left these in module dirs; packaging skips them
+    path = Path(path)
+    return path.parent / f".{path.name}.json"
+
+
+def config_cache_path(path: Union[str, Path]) -> Path:
+    """Get the JSON cache path for a YAML config, under ~/.xopt/cache keyed by its absolute path"""
+    import hashlib
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return Path.home() / ".xopt" / "cache" / f"{key}.json"
+
+
+def load_module_config(path: Union[str, Path]) -> Any:
+    """Load an xopt.yaml, reusing a JSON cache of the parsed file when it is fresh
+
+    The parsed YAML is cached as JSON, which is much cheaper to parse,
+    under ~/.xopt/cache so nothing is written into project or module
+    source trees. It is stamped with the YAML file's mtime, ctime and
+    size and only used when the stamp matches exactly, so copies that
+    preserve an older mtime (cp -p, rsync -a, tar) still invalidate it.
+    """
+    path = Path(path)
+    cache_path = config_cache_path(path)
+
+    # Stat before parsing, so an edit made while parsing invalidates the cache
+    st = path.stat()
+    stamp = [st.st_mtime_ns, st.st_ctime_ns, st.st_size]
+    try:
+        cache = load_json(cache_path)
+        if cache["stamp"] == stamp:
+            return cache["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing, unreadable or old-format cache - fall back to parsing the YAML
+        pass
+
+    config = load_yaml(path)
+    write_json_cache(cache_path, {"stamp": stamp, "config": config})
+    return config
+
+
+def json_snapshot(value: Any) -> Optional[bytes]:
+    """Serialize a value to JSON, or None if it wouldn't load back unchanged"""
+    try:
+        data = _dumps(value)
+    except (TypeError, ValueError):
+        return None
+    # Non-string keys, dates and the like don't survive JSON
+    return data if json.loads(data) == value else None
+
+
+def write_json_cache(cache_path: Path, value: Any) -> None:
+    """Atomically write a JSON cache file, ignoring failures"""
+    try:
+        data = json_snapshot(value)
+        if data is None:
+            return
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        # Read-only directories or non-JSON values just skip the cache
+        pass
+
+
+@dataclass
+class ModuleConfig:
+    """Tunables and configurables for a single module"""
+    __slots__ = ("tunables", "configurables")
+
+    tunables: Dict[str, Any]
+    configurables: Dict[str, Any]
+
+    @classmethod
+    def from_yaml(cls, config: Dict[str, Any]) -> "ModuleConfig":
+        """Build from a parsed xopt.yaml in either the new or legacy format"""
+        if 'name' in config:
+            # New format
+            section = config
+        else:
+            # Legacy format - a single "name@version" key
+            section = config[list(config.keys())[0]] or {}
+        return cls.coerce(section)
+
+    @classmethod
+    def coerce(cls, value: Any) -> "ModuleConfig":
+        """Wrap a plain {'tunables': ..., 'configurables': ...} dict, passing ModuleConfig through"""
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, dict):
+            value = {}
+        # Copy so overrides never leak back into a shared/cached config dict
+        return cls(
+            tunables=dict(value.get('tunables') or {}),
+            configurables=dict(value.get('configurables') or {})
+        )
+
+    def apply_overrides(self, overrides: Optional[Dict[str, Any]]) -> None:
+        """Merge tunable/configurable overrides (e.g. from --config) into this config"""
+        if overrides:
+            if "tunables" in overrides:
+                self.tunables.update(overrides["tunables"])
+            if "configurables" in overrides:
+                self.configurables.update(overrides["configurables"])
@@ -1,5 +1,23 @@
 import litellm
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterator
+
+
+def _completion_params(prompt: str, model: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build litellm.completion arguments from call_llm-style parameters"""
+    # Set default parameters
+    params = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": kwargs.get("temperature", 0.1),
+        "max_tokens": kwargs.get("max_tokens", 500)
+    }
+    
+    # Add any additional kwargs
+    for key, value in kwargs.items():
+        if key not in ["temperature", "max_tokens"]:
+            params[key] = value
+    
+    return params
 
 
 def call_llm(prompt: str, model: str = "ollama/llama3.2:3b", trace_instance=None, **kwargs) -> str:
@@ -37,20 +55,7 @@ def call_llm(prompt: str, model: str = "ollama/llama3.2:3b", trace_instance=None
         })
     
     try:
-        # Set default parameters
-        params = {
-            "model": model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": kwargs.get("temperature", 0.1),
-            "max_tokens": kwargs.get("max_tokens", 500)
-        }
-        
-        # Add any additional kwargs
-        for key, value in kwargs.items():
-            if key not in ["temperature", "max_tokens"]:
-                params[key] = value
-        
-        response = litellm.completion(**params)
+        response = litellm.completion(**_completion_params(prompt, model, kwargs))
         llm_response = response.choices[0].message.content.strip()
         
         # Log the LLM response
@@ -71,4 +76,65 @@ def call_llm(prompt: str, model: str = "ollama/llama3.2:3b", trace_instance=None
                 "error": error_msg
             })
         
-        return f"Error: {error_msg}"
\ No newline at end of file
+        return f"Error: {error_msg}"
+
+
+def call_llm_stream(prompt: str, model: str = "ollama/llama3.2:3b", trace_instance=None, **kwargs) -> Iterator[str]:
+    """Stream an LLM response as text chunks - same parameters as call_llm
+    
+    Closing the generator (or breaking out of the loop) stops reading the
+    response, so callers can end generation as soon as they have enough.
+    Pass stop=[...] to have the provider stop at known markers instead.
+    
+    If the call fails, a final "Error: LLM call failed: ..." chunk is
+    yielded (the only chunk when no text arrived, matching call_llm), so
+    callers can tell a truncated response from a complete one.
+    """
+    
+    # Log the LLM call if trace instance is available
+    if trace_instance:
+        trace_instance.log_trace_event("llm_call", {
+            "model": model,
+            "prompt": prompt,
+            "prompt_length": len(prompt),
+            "stream": True
+        })
+    
+    chunks = []
+    response = None
+    failed = False
+    try:
+        params = _completion_params(prompt, model, kwargs)
+        params["stream"] = True
+        response = litellm.completion(**params)
+        for chunk in response:
+            text = chunk.choices[0].delta.content
+            if text:
+                chunks.append(text)
+                yield text
+    
+    except Exception as e:
+        failed = True
+        error_msg = f"LLM call failed: {str(e)}"
+        
+        if trace_instance:
+            trace_instance.log_trace_event("llm_call", {
+                "error": error_msg
+            })
+        
+        yield f"Error: {error_msg}"
+    
+    finally:
+        # Release the HTTP stream when the caller stops early
+        close = getattr(response, "close", None)
+        if close:
+            close()
+        
+        # Log the (possibly truncated) LLM response
+        if trace_instance and not failed:
+            llm_response = "".join(chunks).strip()
+            trace_instance.log_trace_event("llm_call", {
+                "response": llm_response,
+                "response_length": len(llm_response),
+                "status": "success"
+            })
@@ -8,6 +8,9 @@ import json
 class Context(ABC):
     """Interface for step context implementations"""
     
+    # Empty so subclasses can opt into __slots__
+    __slots__ = ()
+    
     @abstractmethod
     def get_context(self, text: Optional[str] = None) -> str:
         """Get context as string, optionally incorporating new text"""
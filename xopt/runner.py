@@ -4,13 +4,17 @@ Module runner for executing xopt modules in isolated virtual environments
 """
 
 import sys
+import io
 import json
 import importlib.util
 import os
+import socket
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from typing import Dict, Any, Optional
 import argparse
-import yaml
+
+from xopt.config import ModuleConfig, load_module_config
 
 
 def load_module_from_path(module_path: Path, module_name: str):
@@ -44,11 +48,10 @@ def run_installed_module(module_name: str, input_data: str, config_overrides: Op
     from xopt.client import client
     
     # Find installed module
-    installed_modules = client().list_installed()
-    if module_name not in installed_modules:
+    module_info = client().get_installed(module_name)
+    if module_info is None:
         raise ValueError(f"Module {module_name} is not installed")
     
-    module_info = installed_modules[module_name]
     module_dir = Path(module_info["installed_at"])
     
     # Handle engine references
@@ -56,37 +59,22 @@ def run_installed_module(module_name: str, input_data: str, config_overrides: Op
         engine = module_info.get("engine")
         engine_name = engine.split("@")[0] if "@" in engine else engine
         
-        if engine_name not in installed_modules:
+        # Use the engine's directory and virtual environment
+        engine_info = client().get_installed(engine_name)
+        if engine_info is None:
             raise ValueError(f"Referenced engine '{engine}' is not installed")
         
-        # Use the engine's directory and virtual environment
-        engine_info = installed_modules[engine_name]
         engine_dir = Path(engine_info["installed_at"])
         
         # Load module config (this module's tunables/configurables)
         config_path = module_dir / "xopt.yaml"
         if config_path.exists():
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-                if 'name' in config:
-                    # New format
-                    module_config = {
-                        'tunables': config.get('tunables', {}),
-                        'configurables': config.get('configurables', {})
-                    }
-                else:
-                    # Legacy format
-                    module_spec = list(config.keys())[0]
-                    module_config = config[module_spec]
+            module_config = ModuleConfig.from_yaml(load_module_config(config_path))
         else:
-            module_config = module_info.get("config", {})
+            module_config = ModuleConfig.coerce(module_info.get("config", {}))
         
         # Apply config overrides
-        if config_overrides:
-            if "tunables" in config_overrides:
-                module_config.setdefault("tunables", {}).update(config_overrides["tunables"])
-            if "configurables" in config_overrides:
-                module_config.setdefault("configurables", {}).update(config_overrides["configurables"])
+        module_config.apply_overrides(config_overrides)
         
         # Execute using the engine's directory
         return _execute_module(engine_dir, engine_name, module_config, input_data)
@@ -95,7 +83,7 @@ def run_installed_module(module_name: str, input_data: str, config_overrides: Op
         return _execute_local_module(module_dir, module_name, module_info, config_overrides, input_data)
 
 
-def _execute_module(module_dir: Path, module_name: str, module_config: Dict[str, Any], input_data: str) -> str:
+def _execute_module(module_dir: Path, module_name: str, module_config: ModuleConfig, input_data: str) -> str:
     """Execute a module with given configuration"""
     import os
     from xopt.client import client
@@ -104,9 +92,11 @@ def _execute_module(module_dir: Path, module_name: str, module_config: Dict[str,
     original_cwd = os.getcwd()
     os.chdir(module_dir)
     
+    client_instance = client()
+    
     try:
         # Load and register ALL installed modules so they can be discovered by other modules
-        installed_modules = client().list_installed()
+        installed_modules = client_instance.list_installed()
         for installed_name, installed_info in installed_modules.items():
             if installed_name != module_name:  # Don't double-load the target module
                 try:
@@ -120,7 +110,6 @@ def _execute_module(module_dir: Path, module_name: str, module_config: Dict[str,
         module_spec = f"{module_name}@1.0.0"  # Default version for execution
         
         # Update client configuration with module config BEFORE loading modules
-        client_instance = client()
         client_instance.config = {module_spec: module_config}
         
         # Load and register the target module
@@ -128,11 +117,11 @@ def _execute_module(module_dir: Path, module_name: str, module_config: Dict[str,
         
         # Find and start the module
         import xopt
-        if module_name in client()._modules:
+        if module_name in client_instance._modules:
             module_instance = xopt.start(
                 module=module_name,
-                configurables=module_config.get("configurables", {}),
-                tunables=module_config.get("tunables", {})
+                configurables=module_config.configurables,
+                tunables=module_config.tunables
             )
             
             # Execute the module
@@ -155,41 +144,162 @@ def _execute_local_module(module_dir: Path, module_name: str, module_info: Dict[
     # Load module configuration
     config_path = module_dir / "xopt.yaml"
     if config_path.exists():
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-            if 'name' in config:
-                # New format
-                module_config = {
-                    'tunables': config.get('tunables', {}),
-                    'configurables': config.get('configurables', {})
-                }
-            else:
-                # Legacy format
-                module_spec = list(config.keys())[0]
-                module_config = config[module_spec]
+        module_config = ModuleConfig.from_yaml(load_module_config(config_path))
     else:
-        module_config = module_info.get("config", {})
+        module_config = ModuleConfig.coerce(module_info.get("config", {}))
     
     # Apply config overrides
-    if config_overrides:
-        if "tunables" in config_overrides:
-            module_config.setdefault("tunables", {}).update(config_overrides["tunables"])
-        if "configurables" in config_overrides:
-            module_config.setdefault("configurables", {}).update(config_overrides["configurables"])
+    module_config.apply_overrides(config_overrides)
     
     return _execute_module(module_dir, module_name, module_config, input_data)
 
 
+# Socket a running `xopt daemon` worker listens on, inside the engine's install dir
+DAEMON_SOCKET = "daemon.sock"
+
+# Seconds to wait for a daemon to pick up a connection (and to answer pings);
+# a busy or hung daemon makes callers fall back instead of blocking
+DAEMON_TIMEOUT = 5.0
+
+# Seconds between a waiting daemon's checks that its socket file is still its own
+_SOCKET_CHECK_INTERVAL = 30.0
+
+_READY = b'{"ready": true}\n'
+
+
+def request_daemon(sock_path: Path, request: Dict[str, Any], timeout: Optional[float] = DAEMON_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Send one JSON request to a daemon and return its reply
+
+    Returns None if no daemon picked the request up, so the caller can do
+    the work itself. Once the request has been handed over, failures raise
+    RuntimeError instead - the daemon may already have acted on it.
+    `timeout` bounds the wait for the reply (None waits for as long as the
+    request takes).
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(sock_path):
+        return None
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(DAEMON_TIMEOUT)
+        try:
+            conn.connect(str(sock_path))
+            f = conn.makefile("rb")
+            # The daemon greets each connection it accepts; a busy one doesn't get to it in time
+            if f.readline() != _READY:
+                return None
+            conn.sendall((json.dumps(request) + "\n").encode())
+        except OSError:
+            # Stale socket file from a daemon that has exited, or a busy/hung one
+            return None
+        
+        try:
+            conn.settimeout(timeout)
+            line = f.readline()
+            if not line:
+                raise RuntimeError("connection closed before reply")
+            return json.loads(line)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Daemon at {sock_path} failed to answer: {e}") from e
+        finally:
+            f.close()
+
+
+def _handle_request(conn: socket.socket) -> bool:
+    """Answer one daemon connection; returns False once asked to stop"""
+    conn.sendall(_READY)
+    with conn.makefile("rb") as f:
+        line = f.readline()
+    if not line:
+        # Client gave up before sending a request
+        return True
+    
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    if request.get("stop"):
+        conn.sendall(b'{"ok": true}\n')
+        return False
+    
+    if "module" not in request:
+        # Liveness check
+        reply = {"ok": True}
+    else:
+        # Send what the module prints back with the reply - the worker's own stdio goes nowhere
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                config_overrides = json.loads(request["config"]) if request.get("config") else None
+                output = run_installed_module(request["module"], request["input"], config_overrides)
+            reply = {"ok": True, "output": output}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        reply["stdout"] = stdout.getvalue()
+        reply["stderr"] = stderr.getvalue()
+    
+    conn.sendall((json.dumps(reply) + "\n").encode())
+    return True
+
+
+def _owns_socket(sock_path: str, inode: int) -> bool:
+    try:
+        return os.stat(sock_path).st_ino == inode
+    except OSError:
+        return False
+
+
+def serve(sock_path: str):
+    """Handle run requests on a unix socket, one at a time, until asked to stop
+
+    The daemon also exits once its socket file is removed or replaced
+    (e.g. its module was uninstalled), since nothing can reach it anymore.
+    """
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sock_path)
+    server.listen()
+    server.settimeout(_SOCKET_CHECK_INTERVAL)
+    inode = os.stat(sock_path).st_ino
+    try:
+        while _owns_socket(sock_path, inode):
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            
+            # One bad or vanished client must not take the daemon down
+            with conn:
+                try:
+                    conn.settimeout(DAEMON_TIMEOUT)
+                    if not _handle_request(conn):
+                        break
+                except (ValueError, OSError):
+                    pass
+    finally:
+        server.close()
+        if _owns_socket(sock_path, inode):
+            os.unlink(sock_path)
+
+
 def main():
     """Main entry point for module runner"""
     parser = argparse.ArgumentParser(description="Run xopt modules in isolated environments")
-    parser.add_argument("--module", required=True, help="Module name to run")
-    parser.add_argument("--input", required=True, help="Input data for the module")
+    parser.add_argument("--module", help="Module name to run")
+    parser.add_argument("--input", help="Input data for the module")
     parser.add_argument("--config", help="JSON string with config overrides")
     parser.add_argument("--module-dir", help="Path to module directory (for development)")
+    parser.add_argument("--serve", metavar="SOCKET", help="Serve run requests on a unix socket (used by `xopt daemon`)")
     
     args = parser.parse_args()
     
+    if args.serve:
+        serve(args.serve)
+        return
+    
+    if args.module is None or args.input is None:
+        parser.error("the following arguments are required: --module, --input")
+    
     try:
         # Parse config overrides if provided
         config_overrides = None
@@ -197,8 +307,9 @@ def main():
             config_overrides = json.loads(args.config)
         
         if args.module_dir:
-            # Development mode - run from module directory
-            module_dir = Path(args.module_dir)
+            # Development mode - run from module directory. Resolve first so the
+            # module and its xopt.yaml are found by absolute path after the chdir
+            module_dir = Path(args.module_dir).resolve()
             original_cwd = os.getcwd()
             os.chdir(module_dir)
             
@@ -209,29 +320,20 @@ def main():
                 # Load config
                 config_path = module_dir / "xopt.yaml"
                 if config_path.exists():
-                    with open(config_path) as f:
-                        config = yaml.safe_load(f)
-                        if 'name' in config:
-                            # New format
-                            module_config = {
-                                'tunables': config.get('tunables', {}),
-                                'configurables': config.get('configurables', {})
-                            }
-                            module_spec = f"{config['name']}@{config.get('version', '1.0.0')}"
-                        else:
-                            # Legacy format
-                            module_spec = list(config.keys())[0]
-                            module_config = config[module_spec]
+                    config = load_module_config(config_path)
+                    module_config = ModuleConfig.from_yaml(config)
+                    if 'name' in config:
+                        # New format
+                        module_spec = f"{config['name']}@{config.get('version', '1.0.0')}"
+                    else:
+                        # Legacy format
+                        module_spec = list(config.keys())[0]
                 else:
-                    module_config = {}
+                    module_config = ModuleConfig(tunables={}, configurables={})
                     module_spec = f"{args.module}@1.0.0"
                 
                 # Apply overrides
-                if config_overrides:
-                    if "tunables" in config_overrides:
-                        module_config.setdefault("tunables", {}).update(config_overrides["tunables"])
-                    if "configurables" in config_overrides:
-                        module_config.setdefault("configurables", {}).update(config_overrides["configurables"])
+                module_config.apply_overrides(config_overrides)
                 
                 # Set up client config - ensure proper nested structure
                 from xopt.client import client
@@ -243,8 +345,8 @@ def main():
                 module_name = module_spec.split("@")[0]
                 module_instance = xopt.start(
                     module=args.module,
-                    configurables=module_config.get("configurables", {}),
-                    tunables=module_config.get("tunables", {})
+                    configurables=module_config.configurables,
+                    tunables=module_config.tunables
                 )
                 
                 result = module_instance.call(args.input)